@@ -3,9 +3,11 @@
 Also generates 3x scaled versions for all options (B, D, E, F, H)."""
 import re
 import os
-import glob
+import shutil
 
 OPTION_B_DIR = "/tmp/yaml-benchmark/option-b/rules"
+OPTION_D_DIR = "/tmp/yaml-benchmark/option-d/rules"
+OPTION_E_DIR = "/tmp/yaml-benchmark/option-e/rules"
 OPTION_F_DIR = "/tmp/yaml-benchmark/option-f/rules"
 OPTION_H_DIR = "/tmp/yaml-benchmark/option-h/rules"
 
@@ -18,283 +20,327 @@ SCALE_DIRS = {
     'h': "/tmp/yaml-benchmark/scale3x/option-h/rules",
 }
 
-for d in [OPTION_F_DIR, OPTION_H_DIR] + list(SCALE_DIRS.values()):
-    os.makedirs(d, exist_ok=True)
+# Rule files are read and written as bytes, so every pattern and template below is bytes
+BASH_ESCAPE_RE = re.compile(rb'[\\"$`]')
 
 def escape_bash(s):
-    s = s.replace('\\', '\\\\')
-    s = s.replace('"', '\\"')
-    s = s.replace('$', '\\$')
-    s = s.replace('`', '\\`')
-    return s
+    return BASH_ESCAPE_RE.sub(rb'\\\g<0>', s)
+
+# bytes.translate only maps byte-to-byte, so expand both characters in one regex pass
+DOLLAR_SINGLE_RE = re.compile(rb"['\n]")
+DOLLAR_SINGLE_MAP = {b"'": b"\\'", b'\n': b'\\n'}
 
 def escape_dollar_single(s):
-    return s.replace("'", "\\'").replace('\n', '\\n')
+    return DOLLAR_SINGLE_RE.sub(lambda m: DOLLAR_SINGLE_MAP[m.group()], s)
+
+SCALAR_FIELDS = ['ID', 'ACTION', 'COMMAND', 'PATTERN', 'LEVEL', 'EMOJI', 'DESC', 'DOCS', 'BYPASS']
+FIELD_KEYS = {f.encode(): f.lower() for f in SCALAR_FIELDS + ['ALTERNATIVES', 'VERIFY']}
+EMPTY_RULE = dict.fromkeys([f.lower() for f in SCALAR_FIELDS] + ['ai_warning'], b'')
+
+# Rules are found the way bash sources them, by their RULE_X_ID= line; one scan
+# per rule file then fills in fields. Scalar fields are single-line "..." values,
+# AI_WARNING may span lines, ALTERNATIVES/VERIFY are bash arrays. The lookahead
+# keeps multi-line values from hiding field lines inside them, as per-field
+# searches would.
+SUFFIX_RE = re.compile(rb'^RULE_([A-Z0-9_]+)_ID=', re.MULTILINE)
+LINE_RE = re.compile(rb'''
+    ^(?=RULE_(?P<suffix>[A-Z0-9_]+)_(?:
+        (?P<field>%s)="(?P<value>[^\n]*?)"
+      | AI_WARNING="(?P<ai>.*?)"$
+      | (?P<array>ALTERNATIVES|VERIFY)=\((?P<items>.*?)\)
+    ))''' % '|'.join(SCALAR_FIELDS).encode(), re.MULTILINE | re.DOTALL | re.VERBOSE)
+QUOTED_RE = re.compile(rb'"(.*?)"', re.DOTALL)
 
 def parse_rule_file(filepath):
-    with open(filepath, 'r') as f:
+    with open(filepath, 'rb') as f:
         content = f.read()
-    suffixes = re.findall(r'^RULE_([A-Z0-9_]+)_ID=', content, re.MULTILINE)
+    # Binary reads skip universal newlines, so translate CRLF/CR as text mode did
+    content = content.replace(b'\r\n', b'\n').replace(b'\r', b'\n')
+    fields = {}
+    for m in LINE_RE.finditer(content):
+        suffix, field, value, ai, array, items = m.groups()
+        found = fields.setdefault(suffix, {})
+        if field:
+            found.setdefault(FIELD_KEYS[field], value)
+        elif array:
+            found.setdefault(FIELD_KEYS[array], QUOTED_RE.findall(items))
+        else:
+            found.setdefault('ai_warning', ai)
     rules = []
-    for suffix in suffixes:
-        rule = {'suffix': suffix}
-        for field in ['ID', 'ACTION', 'COMMAND', 'PATTERN', 'LEVEL', 'EMOJI', 'DESC', 'DOCS', 'BYPASS']:
-            m = re.search(rf'^RULE_{suffix}_{field}="(.*?)"', content, re.MULTILINE)
-            rule[field.lower()] = m.group(1) if m else ''
-        m = re.search(rf'^RULE_{suffix}_AI_WARNING="(.*?)"$', content, re.MULTILINE | re.DOTALL)
-        rule['ai_warning'] = m.group(1) if m else ''
-        m = re.search(rf'^RULE_{suffix}_ALTERNATIVES=\((.*?)\)', content, re.MULTILINE | re.DOTALL)
-        rule['alternatives'] = re.findall(r'"(.*?)"', m.group(1), re.DOTALL) if m else []
-        m = re.search(rf'^RULE_{suffix}_VERIFY=\((.*?)\)', content, re.MULTILINE | re.DOTALL)
-        rule['verify'] = re.findall(r'"(.*?)"', m.group(1), re.DOTALL) if m else []
-        rules.append(rule)
+    for suffix in SUFFIX_RE.findall(content):
+        rules.append({'suffix': suffix, **EMPTY_RULE, 'alternatives': [], 'verify': [], **fields.get(suffix, {})})
     return rules
 
-def write_option_f(rules, basename, outdir):
+RULE_KEYS = ['suffix', *EMPTY_RULE, 'alternatives', 'verify']
+ESCAPED_FIELDS = ['id', 'command', 'pattern', 'emoji', 'desc', 'docs', 'bypass', 'ai_warning']
+
+def build_columns(rules):
+    """Turn parsed rules into one list per field, plus the escaped and derived columns writers read."""
+    cols = {k: [r[k] for r in rules] for k in RULE_KEYS}
+    for k in ESCAPED_FIELDS:
+        cols['esc_' + k] = [escape_bash(v) for v in cols[k]]
+    esc_alts = [[escape_bash(a) for a in alts] for alts in cols['alternatives']]
+    esc_vers = [[escape_bash(v) for v in vers] for vers in cols['verify']]
+    # Joined once here: D, E and F args on one line, B one "item" per indented line
+    cols['alts_joined'] = [b' '.join([QUOTED_TMPL % a for a in alts]) for alts in esc_alts]
+    cols['vers_joined'] = [b' '.join([QUOTED_TMPL % v for v in vers]) for vers in esc_vers]
+    cols['alts_block_b'] = [b'\n'.join([B_ITEM_TMPL % a for a in alts]) for alts in esc_alts]
+    cols['vers_block_b'] = [b'\n'.join([B_ITEM_TMPL % v for v in vers]) for vers in esc_vers]
+    cols['esc_ai_dollar'] = [escape_dollar_single(ai) if ai else b'' for ai in cols['ai_warning']]
+    cols['f_ai_arg'] = [F_AI_TMPL % ai if ai else b'""' for ai in cols['esc_ai_dollar']]
+    cols['ai_h_block'] = [b''.join(H_AI_TMPL % ln for ln in ai.split(b'\n')
+                                   if ln.decode('utf-8', 'surrogateescape').strip())
+                          for ai in cols['ai_warning']]
+    return cols
+
+def columns(cols, *keys):
+    """Zip the named columns into per-rule tuples."""
+    return zip(*(cols[k] for k in keys))
+
+def write_file(path, out):
+    """Write the joined chunks to path; return the number of lines written."""
+    body = b''.join(out)
+    with open(path, 'wb') as f:
+        f.write(body)
+    return body.count(b'\n')
+
+# Output templates, filled with % so each rule is formatted from a prebuilt string
+SH_HEADER_F = b'#!/usr/bin/env bash\n# Option F: Direct registration\n# shellcheck disable=SC2034\n\n'
+SH_HEADER_3X_TMPL = b'#!/usr/bin/env bash\n# 3x scale copy %d\n# shellcheck disable=SC2034\n\n'
+H_HEADER_TMPL = b'# Option H: Data table format - %s\n\n'
+H_HEADER_3X_TMPL = b'# 3x scale copy %d\n\n'
+SUFFIX_3X_TMPL = b'%s_C%d'
+ID_3X_TMPL = b'%s_c%d'
+QUOTED_TMPL = b'"%s"'
+ALTS_TMPL = b'_alts "%s" %s\n'  # shared by D and F
+VERIFY_TMPL = b'_verify "%s" %s\n'
+
+F_REG_TMPL = b'_reg "%s" "%s" "%s" "%s" "%s" "%s" "%s" "%s" "%s" "%s" %s\n'
+F_AI_TMPL = b"$'%s'"
+
+H_RULE_TMPL = b'RULE %s %s %s %s %s\nPAT %s\nDESC %s\n'
+H_BYPASS_TMPL = b'BYP %s\n'
+H_DOCS_TMPL = b'DOCS %s\n'
+H_ALT_TMPL = b'ALT %s\n'
+H_VERIFY_TMPL = b'CHK %s\n'
+H_AI_TMPL = b'AI %s\n'
+
+B_VARS_TMPL = (b'RULE_%s_ID="%s"\n'
+               b'RULE_%s_ACTION="%s"\n'
+               b'RULE_%s_COMMAND="%s"\n'
+               b'RULE_%s_PATTERN="%s"\n'
+               b'RULE_%s_LEVEL="%s"\n'
+               b'RULE_%s_EMOJI="%s"\n'
+               b'RULE_%s_DESC="%s"\n'
+               b'RULE_%s_DOCS="%s"\n'
+               b'RULE_%s_BYPASS="%s"\n')
+B_ITEM_TMPL = b'    "%s"'
+B_ARRAY_TMPL = b'RULE_%s_%s=(\n%s\n)\n'
+B_EMPTY_ARRAY_TMPL = b'RULE_%s_%s=()\n'
+B_AI_TMPL = b'RULE_%s_AI_WARNING="%s"\n\n'
+B_REGISTER_TMPL = (b'    command_safety_register_rule "%(s)s" \\\n'
+                   b'        "$RULE_%(s)s_ID" "$RULE_%(s)s_ACTION" "$RULE_%(s)s_COMMAND" "$RULE_%(s)s_PATTERN" "$RULE_%(s)s_LEVEL" \\\n'
+                   b'        "$RULE_%(s)s_EMOJI" "$RULE_%(s)s_DESC" "$RULE_%(s)s_DOCS" "$RULE_%(s)s_BYPASS" "$RULE_%(s)s_AI_WARNING" "" \\\n'
+                   b'        "RULE_%(s)s_ALTERNATIVES" "RULE_%(s)s_VERIFY"\n')
+
+D_RULE_TMPL = b'_rule "%s" "%s" "%s" "%s" "%s" "%s" \\\n    "%s" "%s" "%s"\n'
+D_AI_TMPL = b"_ai \"%s\" $'%s'\n"
+
+E_RULE_TMPL = b'_R id="%s" cmd="%s" pat="%s" act="%s" lvl="%s" \\\n   em="%s" desc="%s" docs="%s" byp="%s"\n'
+E_ALTS_TMPL = b'_A "%s" %s\n'
+E_VERIFY_TMPL = b'_V "%s" %s\n'
+E_AI_TMPL = b"_W \"%s\" $'%s'\n"
+
+def emit_f(out, cols, suffixes, rids):
+    """Append every rule's Option F _reg/_alts/_verify lines."""
+    for s, rid, (action, command, pattern, level, emoji, desc, docs, bypass, ai_arg, alts, vers) in zip(
+            suffixes, rids, columns(cols, 'action', 'esc_command', 'esc_pattern', 'level', 'esc_emoji',
+                                    'esc_desc', 'esc_docs', 'esc_bypass', 'f_ai_arg', 'alts_joined', 'vers_joined')):
+        out.append(F_REG_TMPL % (s, rid, action, command, pattern, level, emoji, desc, docs, bypass, ai_arg))
+        if alts:
+            out.append(ALTS_TMPL % (rid, alts))
+        if vers:
+            out.append(VERIFY_TMPL % (rid, vers))
+        out.append(b'\n')
+
+def emit_h(out, cols, rids):
+    """Append every rule's Option H RULE ... END block."""
+    for rid, (command, action, level, emoji, pattern, desc, bypass, docs, alts, vers, ai_block) in zip(
+            rids, columns(cols, 'command', 'action', 'level', 'emoji', 'pattern', 'desc', 'bypass', 'docs',
+                          'alternatives', 'verify', 'ai_h_block')):
+        out.append(H_RULE_TMPL % (rid, command, action, level, emoji, pattern, desc))
+        if bypass:
+            out.append(H_BYPASS_TMPL % bypass)
+        if docs:
+            out.append(H_DOCS_TMPL % docs)
+        out.extend([H_ALT_TMPL % alt for alt in alts])
+        out.extend([H_VERIFY_TMPL % ver for ver in vers])
+        out.append(ai_block)
+        out.append(b'END\n\n')
+
+def write_option_f(cols, basename, outdir):
     """Option F: Direct registration, no intermediary variables."""
     path = os.path.join(outdir, basename)
-    with open(path, 'w') as f:
-        f.write('#!/usr/bin/env bash\n# Option F: Direct registration\n# shellcheck disable=SC2034\n\n')
-        for r in rules:
-            s = r['suffix']
-            ai = escape_dollar_single(r['ai_warning']) if r['ai_warning'] else ''
-            ai_arg = f"$'{ai}'" if ai else '""'
-            f.write(f'_reg "{s}" "{escape_bash(r["id"])}" "{r["action"]}" "{escape_bash(r["command"])}" '
-                    f'"{escape_bash(r["pattern"])}" "{r["level"]}" '
-                    f'"{escape_bash(r["emoji"])}" "{escape_bash(r["desc"])}" '
-                    f'"{escape_bash(r["docs"])}" "{escape_bash(r["bypass"])}" '
-                    f'{ai_arg}\n')
-            if r['alternatives']:
-                parts = ' '.join(f'"{escape_bash(a)}"' for a in r['alternatives'])
-                f.write(f'_alts "{r["id"]}" {parts}\n')
-            if r['verify']:
-                parts = ' '.join(f'"{escape_bash(v)}"' for v in r['verify'])
-                f.write(f'_verify "{r["id"]}" {parts}\n')
-            f.write('\n')
-    return path
-
-def write_option_h(rules, basename, outdir):
+    out = [SH_HEADER_F]
+    emit_f(out, cols, cols['suffix'], cols['esc_id'])
+    return path, write_file(path, out)
+
+def write_option_h(cols, basename, outdir):
     """Option H: Heredoc data tables."""
     path = os.path.join(outdir, basename.replace('.sh', '.rules'))
-    with open(path, 'w') as f:
-        f.write(f'# Option H: Data table format - {basename}\n\n')
-        for r in rules:
-            f.write(f'RULE {r["id"]} {r["command"]} {r["action"]} {r["level"]} {r["emoji"]}\n')
-            if r['pattern']:
-                f.write(f'PAT {r["pattern"]}\n')
-            else:
-                f.write('PAT \n')
-            f.write(f'DESC {r["desc"]}\n')
-            if r['bypass']:
-                f.write(f'BYP {r["bypass"]}\n')
-            if r['docs']:
-                f.write(f'DOCS {r["docs"]}\n')
-            for alt in r['alternatives']:
-                f.write(f'ALT {alt}\n')
-            for ver in r['verify']:
-                f.write(f'CHK {ver}\n')
-            if r['ai_warning']:
-                for line in r['ai_warning'].split('\n'):
-                    if line.strip():
-                        f.write(f'AI {line}\n')
-            f.write('END\n\n')
-    return path
-
-def write_option_b_3x(rules, basename, outdir, copy_num):
-    """Scale original bash rules 3x."""
-    path = os.path.join(outdir, f'{basename[:-3]}_copy{copy_num}.sh')
-    with open(path, 'w') as f:
-        f.write(f'#!/usr/bin/env bash\n# 3x scale copy {copy_num}\n# shellcheck disable=SC2034\n\n')
-        for r in rules:
-            s = f'{r["suffix"]}_C{copy_num}'
-            rid = f'{r["id"]}_c{copy_num}'
-            ai = escape_bash(r['ai_warning'])
-            f.write(f'RULE_{s}_ID="{rid}"\n')
-            f.write(f'RULE_{s}_ACTION="{r["action"]}"\n')
-            f.write(f'RULE_{s}_COMMAND="{escape_bash(r["command"])}"\n')
-            f.write(f'RULE_{s}_PATTERN="{escape_bash(r["pattern"])}"\n')
-            f.write(f'RULE_{s}_LEVEL="{r["level"]}"\n')
-            f.write(f'RULE_{s}_EMOJI="{escape_bash(r["emoji"])}"\n')
-            f.write(f'RULE_{s}_DESC="{escape_bash(r["desc"])}"\n')
-            f.write(f'RULE_{s}_DOCS="{escape_bash(r["docs"])}"\n')
-            f.write(f'RULE_{s}_BYPASS="{escape_bash(r["bypass"])}"\n')
-            alts_str = '\n'.join(f'    "{escape_bash(a)}"' for a in r['alternatives'])
-            f.write(f'RULE_{s}_ALTERNATIVES=(\n{alts_str}\n)\n' if alts_str else f'RULE_{s}_ALTERNATIVES=()\n')
-            vers_str = '\n'.join(f'    "{escape_bash(v)}"' for v in r['verify'])
-            f.write(f'RULE_{s}_VERIFY=(\n{vers_str}\n)\n' if vers_str else f'RULE_{s}_VERIFY=()\n')
-            f.write(f'RULE_{s}_AI_WARNING="{ai}"\n\n')
-        # Register function
-        f.write('_command_safety_register_rules() {\n')
-        for r in rules:
-            s = f'{r["suffix"]}_C{copy_num}'
-            f.write(f'    command_safety_register_rule "{s}" \\\n')
-            f.write(f'        "$RULE_{s}_ID" "$RULE_{s}_ACTION" "$RULE_{s}_COMMAND" "$RULE_{s}_PATTERN" "$RULE_{s}_LEVEL" \\\n')
-            f.write(f'        "$RULE_{s}_EMOJI" "$RULE_{s}_DESC" "$RULE_{s}_DOCS" "$RULE_{s}_BYPASS" "$RULE_{s}_AI_WARNING" "" \\\n')
-            f.write(f'        "RULE_{s}_ALTERNATIVES" "RULE_{s}_VERIFY"\n')
-        f.write('}\n')
-    return path
-
-def write_option_d_3x(rules, basename, outdir, copy_num):
-    path = os.path.join(outdir, f'{basename[:-3]}_copy{copy_num}.sh')
-    with open(path, 'w') as f:
-        f.write(f'#!/usr/bin/env bash\n# 3x scale copy {copy_num}\n# shellcheck disable=SC2034\n\n')
-        for r in rules:
-            rid = f'{r["id"]}_c{copy_num}'
-            ai = escape_dollar_single(r['ai_warning']) if r['ai_warning'] else ''
-            f.write(f'_rule "{rid}" "{escape_bash(r["command"])}" '
-                    f'"{escape_bash(r["pattern"])}" "{r["action"]}" "{r["level"]}" "{escape_bash(r["emoji"])}" \\\n'
-                    f'    "{escape_bash(r["desc"])}" "{escape_bash(r["docs"])}" "{escape_bash(r["bypass"])}"\n')
-            if r['alternatives']:
-                parts = ' '.join(f'"{escape_bash(a)}"' for a in r['alternatives'])
-                f.write(f'_alts "{rid}" {parts}\n')
-            if r['verify']:
-                parts = ' '.join(f'"{escape_bash(v)}"' for v in r['verify'])
-                f.write(f'_verify "{rid}" {parts}\n')
-            if ai:
-                f.write(f"_ai \"{rid}\" $'{ai}'\n")
-            f.write('\n')
-    return path
-
-def write_option_e_3x(rules, basename, outdir, copy_num):
-    path = os.path.join(outdir, f'{basename[:-3]}_copy{copy_num}.sh')
-    with open(path, 'w') as f:
-        f.write(f'#!/usr/bin/env bash\n# 3x scale copy {copy_num}\n# shellcheck disable=SC2034\n\n')
-        for r in rules:
-            rid = f'{r["id"]}_c{copy_num}'
-            ai = escape_dollar_single(r['ai_warning']) if r['ai_warning'] else ''
-            f.write(f'_R id="{rid}" cmd="{escape_bash(r["command"])}" '
-                    f'pat="{escape_bash(r["pattern"])}" act="{r["action"]}" lvl="{r["level"]}" \\\n'
-                    f'   em="{escape_bash(r["emoji"])}" desc="{escape_bash(r["desc"])}" '
-                    f'docs="{escape_bash(r["docs"])}" byp="{escape_bash(r["bypass"])}"\n')
-            if r['alternatives']:
-                parts = ' '.join(f'"{escape_bash(a)}"' for a in r['alternatives'])
-                f.write(f'_A "{rid}" {parts}\n')
-            if r['verify']:
-                parts = ' '.join(f'"{escape_bash(v)}"' for v in r['verify'])
-                f.write(f'_V "{rid}" {parts}\n')
-            if ai:
-                f.write(f"_W \"{rid}\" $'{ai}'\n")
-            f.write('\n')
-    return path
-
-def write_option_f_3x(rules, basename, outdir, copy_num):
-    path = os.path.join(outdir, f'{basename[:-3]}_copy{copy_num}.sh')
-    with open(path, 'w') as f:
-        f.write(f'#!/usr/bin/env bash\n# 3x scale copy {copy_num}\n# shellcheck disable=SC2034\n\n')
-        for r in rules:
-            s = f'{r["suffix"]}_C{copy_num}'
-            rid = f'{r["id"]}_c{copy_num}'
-            ai = escape_dollar_single(r['ai_warning']) if r['ai_warning'] else ''
-            ai_arg = f"$'{ai}'" if ai else '""'
-            f.write(f'_reg "{s}" "{rid}" "{r["action"]}" "{escape_bash(r["command"])}" '
-                    f'"{escape_bash(r["pattern"])}" "{r["level"]}" '
-                    f'"{escape_bash(r["emoji"])}" "{escape_bash(r["desc"])}" '
-                    f'"{escape_bash(r["docs"])}" "{escape_bash(r["bypass"])}" '
-                    f'{ai_arg}\n')
-            if r['alternatives']:
-                parts = ' '.join(f'"{escape_bash(a)}"' for a in r['alternatives'])
-                f.write(f'_alts "{rid}" {parts}\n')
-            if r['verify']:
-                parts = ' '.join(f'"{escape_bash(v)}"' for v in r['verify'])
-                f.write(f'_verify "{rid}" {parts}\n')
-            f.write('\n')
-    return path
-
-def write_option_h_3x(rules, basename, outdir, copy_num):
-    path = os.path.join(outdir, f'{basename[:-3]}_copy{copy_num}.rules')
-    with open(path, 'w') as f:
-        f.write(f'# 3x scale copy {copy_num}\n\n')
-        for r in rules:
-            rid = f'{r["id"]}_c{copy_num}'
-            f.write(f'RULE {rid} {r["command"]} {r["action"]} {r["level"]} {r["emoji"]}\n')
-            f.write(f'PAT {r["pattern"]}\n' if r['pattern'] else 'PAT \n')
-            f.write(f'DESC {r["desc"]}\n')
-            if r['bypass']: f.write(f'BYP {r["bypass"]}\n')
-            if r['docs']: f.write(f'DOCS {r["docs"]}\n')
-            for alt in r['alternatives']: f.write(f'ALT {alt}\n')
-            for ver in r['verify']: f.write(f'CHK {ver}\n')
-            if r['ai_warning']:
-                for line in r['ai_warning'].split('\n'):
-                    if line.strip(): f.write(f'AI {line}\n')
-            f.write('END\n\n')
-    return path
+    out = [H_HEADER_TMPL % basename.encode()]
+    emit_h(out, cols, cols['id'])
+    return path, write_file(path, out)
+
+def emit_b_3x(out, cols, suffixes, rids):
+    """Append every rule's Option B variables, then the function registering them."""
+    for s, rid, (action, command, pattern, level, emoji, desc, docs, bypass, ai, alts, vers) in zip(
+            suffixes, rids, columns(cols, 'action', 'esc_command', 'esc_pattern', 'level', 'esc_emoji',
+                                    'esc_desc', 'esc_docs', 'esc_bypass', 'esc_ai_warning', 'alts_block_b', 'vers_block_b')):
+        out.append(B_VARS_TMPL % (s, rid, s, action, s, command, s, pattern, s, level,
+                                  s, emoji, s, desc, s, docs, s, bypass))
+        out.append(B_ARRAY_TMPL % (s, b'ALTERNATIVES', alts) if alts
+                   else B_EMPTY_ARRAY_TMPL % (s, b'ALTERNATIVES'))
+        out.append(B_ARRAY_TMPL % (s, b'VERIFY', vers) if vers
+                   else B_EMPTY_ARRAY_TMPL % (s, b'VERIFY'))
+        out.append(B_AI_TMPL % (s, ai))
+    out.append(b'_command_safety_register_rules() {\n')
+    out.extend([B_REGISTER_TMPL % {b's': s} for s in suffixes])
+    out.append(b'}\n')
+
+def emit_de_3x(out, cols, rids, rule_tmpl, alts_tmpl, verify_tmpl, ai_tmpl):
+    """Append every rule's Option D or E lines; the two differ only in their templates."""
+    for rid, (command, pattern, action, level, emoji, desc, docs, bypass, ai, alts, vers) in zip(
+            rids, columns(cols, 'esc_command', 'esc_pattern', 'action', 'level', 'esc_emoji',
+                          'esc_desc', 'esc_docs', 'esc_bypass', 'esc_ai_dollar', 'alts_joined', 'vers_joined')):
+        out.append(rule_tmpl % (rid, command, pattern, action, level, emoji, desc, docs, bypass))
+        if alts:
+            out.append(alts_tmpl % (rid, alts))
+        if vers:
+            out.append(verify_tmpl % (rid, vers))
+        if ai:
+            out.append(ai_tmpl % (rid, ai))
+        out.append(b'\n')
+
+def write_all_3x(cols, basename, copy_num):
+    """Write one 3x copy of a rule file for B, D, E, F and H from its columns."""
+    suffixes = [SUFFIX_3X_TMPL % (s, copy_num) for s in cols['suffix']]
+    rids = [ID_3X_TMPL % (i, copy_num) for i in cols['id']]
+    sh_header = SH_HEADER_3X_TMPL % copy_num
+    b_out, d_out, e_out, f_out = [sh_header], [sh_header], [sh_header], [sh_header]
+    h_out = [H_HEADER_3X_TMPL % copy_num]
+    emit_b_3x(b_out, cols, suffixes, rids)
+    emit_de_3x(d_out, cols, rids, D_RULE_TMPL, ALTS_TMPL, VERIFY_TMPL, D_AI_TMPL)
+    emit_de_3x(e_out, cols, rids, E_RULE_TMPL, E_ALTS_TMPL, E_VERIFY_TMPL, E_AI_TMPL)
+    emit_f(f_out, cols, suffixes, rids)
+    emit_h(h_out, cols, rids)
+    name = f'{basename[:-3]}_copy{copy_num}'
+    write_file(os.path.join(SCALE_DIRS['b'], f'{name}.sh'), b_out)
+    write_file(os.path.join(SCALE_DIRS['d'], f'{name}.sh'), d_out)
+    write_file(os.path.join(SCALE_DIRS['e'], f'{name}.sh'), e_out)
+    write_file(os.path.join(SCALE_DIRS['f'], f'{name}.sh'), f_out)
+    write_file(os.path.join(SCALE_DIRS['h'], f'{name}.rules'), h_out)
+
+def list_rule_files(d, ext, skip='settings.sh'):
+    """Sorted paths of the *ext rule files in d, minus skip; [] if d is missing, like glob."""
+    try:
+        with os.scandir(d) as it:
+            return sorted(e.path for e in it
+                          if e.name.endswith(ext) and not e.name.startswith('.')
+                          and e.name != skip and e.is_file())
+    except FileNotFoundError:
+        return []
+
+READ_CHUNK = 1 << 20
+
+def count_lines(path):
+    """Count lines like len(readlines()) by scanning raw 1 MiB chunks."""
+    lines = 0
+    last = b'\n'
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(READ_CHUNK), b''):
+            lines += chunk.count(b'\n')
+            last = chunk[-1:]
+    return lines + (last != b'\n')
+
+def link_or_copy(src, dst):
+    """Hardlink dst to src (copy1 is read-only input); copy across filesystems."""
+    if os.path.lexists(dst):
+        os.remove(dst)
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
 
 # ============= MAIN =============
-all_rules_by_file = {}
-total_rules = 0
-
-for filepath in sorted(glob.glob(os.path.join(OPTION_B_DIR, "*.sh"))):
-    basename = os.path.basename(filepath)
-    if basename == 'settings.sh':
-        continue
-    rules = parse_rule_file(filepath)
-    all_rules_by_file[basename] = rules
-    total_rules += len(rules)
-
-print(f"Parsed {total_rules} rules from {len(all_rules_by_file)} files\n")
-
-# Generate 1x versions (F and H)
-f_total = h_total = 0
-for basename, rules in all_rules_by_file.items():
-    fp = write_option_f(rules, basename, OPTION_F_DIR)
-    hp = write_option_h(rules, basename, OPTION_H_DIR)
-    with open(fp) as x: fl = len(x.readlines())
-    with open(hp) as x: hl = len(x.readlines())
-    f_total += fl
-    h_total += hl
-    print(f"  {basename}: F={fl} H={hl}")
-
-print(f"\n1x totals: F={f_total} H={h_total}")
-
-# Generate 3x scaled versions for B, D, E, F, H
-print("\n=== Generating 3x scale (213 rules) ===")
-for basename, rules in all_rules_by_file.items():
-    for copy in [2, 3]:  # copy 1 = originals
-        write_option_b_3x(rules, basename, SCALE_DIRS['b'], copy)
-        write_option_d_3x(rules, basename, SCALE_DIRS['d'], copy)
-        write_option_e_3x(rules, basename, SCALE_DIRS['e'], copy)
-        write_option_f_3x(rules, basename, SCALE_DIRS['f'], copy)
-        write_option_h_3x(rules, basename, SCALE_DIRS['h'], copy)
-
-# Copy originals as copy1 for B
-for filepath in sorted(glob.glob(os.path.join(OPTION_B_DIR, "*.sh"))):
-    basename = os.path.basename(filepath)
-    if basename == 'settings.sh': continue
-    import shutil
-    shutil.copy2(filepath, os.path.join(SCALE_DIRS['b'], f'{basename[:-3]}_copy1.sh'))
-
-# Copy D originals as copy1
-for filepath in sorted(glob.glob("/tmp/yaml-benchmark/option-d/rules/*.sh")):
-    basename = os.path.basename(filepath)
-    if basename == 'settings.sh': continue
-    import shutil
-    shutil.copy2(filepath, os.path.join(SCALE_DIRS['d'], f'{basename[:-3]}_copy1.sh'))
-
-# Copy E originals as copy1
-for filepath in sorted(glob.glob("/tmp/yaml-benchmark/option-e/rules/*.sh")):
-    basename = os.path.basename(filepath)
-    if basename == 'settings.sh': continue
-    import shutil
-    shutil.copy2(filepath, os.path.join(SCALE_DIRS['e'], f'{basename[:-3]}_copy1.sh'))
-
-# Copy F originals as copy1
-for filepath in sorted(glob.glob(os.path.join(OPTION_F_DIR, "*.sh"))):
-    basename = os.path.basename(filepath)
-    import shutil
-    shutil.copy2(filepath, os.path.join(SCALE_DIRS['f'], f'{basename[:-3]}_copy1.sh'))
-
-# Copy H originals as copy1
-for filepath in sorted(glob.glob(os.path.join(OPTION_H_DIR, "*.rules"))):
-    basename = os.path.basename(filepath)
-    name = basename.replace('.rules', '')
-    import shutil
-    shutil.copy2(filepath, os.path.join(SCALE_DIRS['h'], f'{name}_copy1.rules'))
-
-# Count 3x lines
-for opt, d in SCALE_DIRS.items():
-    ext = '.rules' if opt == 'h' else '.sh'
-    total = sum(len(open(f).readlines()) for f in glob.glob(os.path.join(d, f'*{ext}')))
-    files = len(glob.glob(os.path.join(d, f'*{ext}')))
-    print(f"  3x Option {opt.upper()}: {total} lines ({files} files)")
-
-print("\nDone!")
+def main():
+    for d in [OPTION_F_DIR, OPTION_H_DIR] + list(SCALE_DIRS.values()):
+        os.makedirs(d, exist_ok=True)
+
+    all_rules_by_file = {}
+    total_rules = 0
+
+    option_b_files = list_rule_files(OPTION_B_DIR, '.sh')
+    for filepath in option_b_files:
+        basename = os.path.basename(filepath)
+        cols = build_columns(parse_rule_file(filepath))
+        all_rules_by_file[basename] = cols
+        total_rules += len(cols['id'])
+
+    print(f"Parsed {total_rules} rules from {len(all_rules_by_file)} files\n")
+
+    # Generate 1x versions (F and H)
+    f_total = h_total = 0
+    for basename, cols in all_rules_by_file.items():
+        _, fl = write_option_f(cols, basename, OPTION_F_DIR)
+        _, hl = write_option_h(cols, basename, OPTION_H_DIR)
+        f_total += fl
+        h_total += hl
+        print(f"  {basename}: F={fl} H={hl}")
+
+    print(f"\n1x totals: F={f_total} H={h_total}")
+
+    # Generate 3x scaled versions for B, D, E, F, H
+    print("\n=== Generating 3x scale (213 rules) ===")
+    for basename, cols in all_rules_by_file.items():
+        for copy in [2, 3]:  # copy 1 = originals
+            write_all_3x(cols, basename, copy)
+
+    # Copy originals as copy1 for B
+    for filepath in option_b_files:
+        basename = os.path.basename(filepath)
+        link_or_copy(filepath, os.path.join(SCALE_DIRS['b'], f'{basename[:-3]}_copy1.sh'))
+
+    # Copy D originals as copy1
+    for filepath in list_rule_files(OPTION_D_DIR, '.sh'):
+        basename = os.path.basename(filepath)
+        link_or_copy(filepath, os.path.join(SCALE_DIRS['d'], f'{basename[:-3]}_copy1.sh'))
+
+    # Copy E originals as copy1
+    for filepath in list_rule_files(OPTION_E_DIR, '.sh'):
+        basename = os.path.basename(filepath)
+        link_or_copy(filepath, os.path.join(SCALE_DIRS['e'], f'{basename[:-3]}_copy1.sh'))
+
+    # Copy F originals as copy1
+    for filepath in list_rule_files(OPTION_F_DIR, '.sh', skip=None):
+        basename = os.path.basename(filepath)
+        link_or_copy(filepath, os.path.join(SCALE_DIRS['f'], f'{basename[:-3]}_copy1.sh'))
+
+    # Copy H originals as copy1
+    for filepath in list_rule_files(OPTION_H_DIR, '.rules', skip=None):
+        basename = os.path.basename(filepath)
+        name = basename.replace('.rules', '')
+        link_or_copy(filepath, os.path.join(SCALE_DIRS['h'], f'{name}_copy1.rules'))
+
+    # Count 3x lines
+    for opt, d in SCALE_DIRS.items():
+        ext = '.rules' if opt == 'h' else '.sh'
+        paths = list_rule_files(d, ext, skip=None)
+        total = sum(count_lines(f) for f in paths)
+        print(f"  3x Option {opt.upper()}: {total} lines ({len(paths)} files)")
+
+    print("\nDone!")
+
+
+if __name__ == '__main__':
+    main()